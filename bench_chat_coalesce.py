@@ -0,0 +1,106 @@
+"""채팅 송신 묶음(CHAT_COALESCE_MS) 효과 측정 (python bench_chat_coalesce.py)
+
+한 방에 클라이언트 --clients개를 붙이고, 틱마다 채팅 메시지 --burst개와
+접속자 수 시스템 메시지 --joins개를 몰아서 발행한다 (대회 중 입장/퇴장 폭주 상황).
+묶음 없음(0 ms)과 --window ms를 비교해서 다음을 출력한다.
+
+- 프레임 수: 클라이언트로 실제 보낸 send 호출 수 (= WebSocket 프레임/송신 syscall)
+- 프레임/초, 전달 메시지/초: 모든 클라이언트가 마지막 메시지를 받을 때까지의 처리량
+- 접속자 수 메시지: 묶음이 있으면 창마다 마지막 값만 전달됨
+
+    python bench_chat_coalesce.py --clients 1000 --ticks 50 --burst 20 --joins 10 --window 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--clients", type=int, default=1000, help="클라이언트 수")
+parser.add_argument("--ticks", type=int, default=50, help="폭주 횟수")
+parser.add_argument("--burst", type=int, default=20, help="틱당 채팅 메시지 수")
+parser.add_argument("--joins", type=int, default=10, help="틱당 접속자 수 메시지 수")
+parser.add_argument("--tick-ms", type=float, default=20.0, help="틱 간격")
+parser.add_argument("--window", type=float, default=5.0, help="비교할 묶음 시간 (ms)")
+args = parser.parse_args()
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ["CHAT_REPLAY_ON_CONNECT"] = "0"
+
+import main
+from pubsub import InProcessBackend
+
+ROOM = "bench"
+
+class CountingClient:
+    """받은 프레임 수만 세는 가상 클라이언트"""
+    def __init__(self, counts: dict):
+        self.counts = counts
+        self.frames = 0
+        self.messages = 0
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        self.frames += 1
+        self.messages += self.counts.setdefault(frame, count_chat_messages(frame))
+
+    async def close(self, code: int = 1000):
+        pass
+
+def count_chat_messages(frame: str) -> int:
+    payload = json.loads(frame)
+    items = payload if isinstance(payload, list) else [payload]
+    return sum(1 for item in items if item.get("type") == "message")
+
+async def run(window_ms: float) -> dict:
+    main.CHAT_COALESCE_MS = window_ms
+    backend = InProcessBackend()
+    manager = main.ConnectionManager(backend)
+    await backend.start(manager.deliver)
+    counts: dict = {}
+    clients = [CountingClient(counts) for _ in range(args.clients)]
+    for client in clients:
+        await manager.connect(client, ROOM)
+
+    expected = args.ticks * args.burst
+    started = time.perf_counter()
+    for tick in range(args.ticks):
+        for index in range(args.joins):
+            await manager.broadcast(ROOM, {"type": "system", "room": ROOM, "count": args.clients + index,
+                                           "message": f"현재 접속자: {args.clients + index}명"})
+        for index in range(args.burst):
+            await manager.broadcast(ROOM, {"type": "message", "room": ROOM, "username": f"user{index}",
+                                           "message": f"tick {tick} #{index}", "timestamp": "00:00:00"})
+        await asyncio.sleep(args.tick_ms / 1000)
+    while any(client.messages < expected for client in clients):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started
+
+    room = manager.rooms[ROOM]
+    for client in clients:
+        manager.disconnect(client, ROOM)
+    frames = sum(client.frames for client in clients)
+    return {
+        "frames": frames,
+        "elapsed": elapsed,
+        "frames_per_client": frames / args.clients,
+        "broadcast_frames": room.frames_sent,
+        "dropped": manager.dropped_connections,
+        "delivered_per_second": expected * args.clients / elapsed,
+    }
+
+def summary(name: str, result: dict):
+    print(f"{name:>8}: 프레임 {result['frames']:9d}개 (클라이언트당 {result['frames_per_client']:6.0f}, 방 송신 {result['broadcast_frames']:5d}회)  "
+          f"{result['frames'] / result['elapsed']:10.0f} 프레임/초  {result['delivered_per_second']:10.0f} 메시지/초  "
+          f"{result['elapsed']:6.2f} s  끊긴 연결 {result['dropped']}")
+
+async def main_async():
+    print(f"클라이언트 {args.clients}개, 틱 {args.ticks}회 × (채팅 {args.burst} + 접속자 수 {args.joins}), 틱 간격 {args.tick_ms:.0f} ms\n")
+    summary("묶음 없음", await run(0))
+    summary(f"{args.window:g} ms", await run(args.window))
+
+if __name__ == "__main__":
+    asyncio.run(main_async())
@@ -0,0 +1,137 @@
+"""채팅 브로드캐스트 부하 테스트 (python bench_chat_fanout.py)
+
+한 방에 가상 클라이언트 수백 개를 붙이고 일정한 속도로 메시지를 발행해서
+정상 클라이언트의 전달 지연(발행 예정 시각 → 수신) p50/p99를 잰다.
+일부 클라이언트는 프레임 하나 받는 데 --slow-ms씩 걸리는 느린 클라이언트다.
+
+- 대기열: 지금의 ConnectionManager (연결별 송신 대기열 + 전송 태스크, 넘치면 연결 종료)
+- 순차 전송: 예전 broadcast처럼 연결마다 차례로 send_json을 기다림 (비교 기준, 처음 --baseline-messages개만)
+
+느린 클라이언트는 송신 대기열(SEND_QUEUE_SIZE)이 넘치면 1013으로 끊겨야 한다.
+
+    python bench_chat_fanout.py --clients 500 --slow 5 --messages 600 --rate 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--clients", type=int, default=500, help="전체 클라이언트 수")
+parser.add_argument("--slow", type=int, default=5, help="그중 느린 클라이언트 수")
+parser.add_argument("--slow-ms", type=float, default=50.0, help="느린 클라이언트의 프레임당 수신 시간")
+parser.add_argument("--messages", type=int, default=600, help="발행할 메시지 수")
+parser.add_argument("--baseline-messages", type=int, default=50, help="순차 전송 비교에 쓸 메시지 수")
+parser.add_argument("--rate", type=float, default=100.0, help="초당 발행 메시지 수")
+args = parser.parse_args()
+
+# 채팅만 측정하므로 DB는 쓰지 않음 (main 가져오기에 필요한 설정만)
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ["CHAT_REPLAY_ON_CONNECT"] = "0"
+
+import main
+from pubsub import InProcessBackend
+
+ROOM = "bench"
+
+class SimulatedClient:
+    """WebSocket 대신 쓰는 가상 클라이언트 - 받은 시각과 프레임만 기록 (파싱은 측정 후에)"""
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.received: list = []
+        self.close_code = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.perf_counter(), frame))
+
+    async def send_json(self, message: dict):
+        await self.send_text(json.dumps(message, ensure_ascii=False))
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+def make_clients() -> list:
+    return [SimulatedClient(args.slow_ms / 1000 if i < args.slow else 0) for i in range(args.clients)]
+
+def chat_message(sequence: int) -> dict:
+    return {"type": "message", "room": ROOM, "username": "bench", "message": "x" * 40, "seq": sequence}
+
+async def publish_all(send, count: int) -> list:
+    """--rate 간격으로 발행 - 지연은 실제 발행 시각이 아닌 예정 시각 기준 (밀린 시간도 지연에 포함)"""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    scheduled = []
+    for sequence in range(count):
+        at = started + sequence / args.rate
+        await asyncio.sleep(max(0.0, at - loop.time()))
+        scheduled.append(time.perf_counter() - (loop.time() - at))
+        await send(chat_message(sequence))
+    return scheduled
+
+async def wait_delivered(clients: list, count: int, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if all(sum(1 for _, frame in client.received if '"seq"' in frame) >= count for client in clients):
+            return
+        await asyncio.sleep(0.01)
+
+def latencies(clients: list, scheduled: list) -> list:
+    sequences: dict = {}
+    result = []
+    for client in clients:
+        for received_at, frame in client.received:
+            if frame not in sequences:
+                payload = json.loads(frame)
+                sequences[frame] = payload.get("seq") if isinstance(payload, dict) else None
+            sequence = sequences[frame]
+            if sequence is not None:
+                result.append((received_at - scheduled[sequence]) * 1000)
+    return result
+
+async def run_queued():
+    backend = InProcessBackend()
+    manager = main.ConnectionManager(backend)
+    await backend.start(manager.deliver)
+    clients = make_clients()
+    for client in clients:
+        await manager.connect(client, ROOM)
+
+    scheduled = await publish_all(lambda message: manager.broadcast(ROOM, message), args.messages)
+    healthy = clients[args.slow:]
+    await wait_delivered(healthy, args.messages)
+    dropped = sum(1 for client in clients[:args.slow] if client.close_code == 1013)
+    for client in clients:
+        manager.disconnect(client, ROOM)
+    return latencies(healthy, scheduled), dropped
+
+async def run_sequential():
+    clients = make_clients()
+
+    async def send(message: dict):
+        for client in clients:
+            await client.send_json(message)
+
+    scheduled = await publish_all(send, args.baseline_messages)
+    return latencies(clients[args.slow:], scheduled), 0
+
+def summary(name: str, values: list, dropped: int):
+    values = sorted(values)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    print(f"{name:>6}: 정상 클라이언트 {len(values):7d}건  p50 {statistics.median(values):8.2f} ms  "
+          f"p99 {p99:8.2f} ms  max {values[-1]:8.2f} ms  느린 연결 종료 {dropped}개")
+
+async def run():
+    print(f"클라이언트 {args.clients}개 (느린 클라이언트 {args.slow}개, 프레임당 {args.slow_ms:.0f} ms), "
+          f"메시지 {args.messages}개 @ {args.rate:.0f}/s\n")
+    summary("대기열", *await run_queued())
+    summary("순차 전송", *await run_sequential())
+
+if __name__ == "__main__":
+    asyncio.run(run())
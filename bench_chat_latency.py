@@ -0,0 +1,180 @@
+"""랭킹 조회 부하 중 채팅 지연 측정 (python bench_chat_latency.py)
+
+임시 SQLite 데이터베이스에 기록을 채운 뒤 같은 이벤트 루프에서
+/ws/chat 왕복 시간(메시지 전송 → 브로드캐스트 수신)을 잰다. 세 구간을 차례로 측정한다.
+
+- 부하 없음
+- 비동기 랭킹 부하: 레벨별 랭킹/그룹 랭킹 API를 동시에 호출
+- 동기 엔진 부하: 같은 쿼리를 예전처럼 동기 엔진으로 이벤트 루프에서 직접 실행 (비교 기준)
+
+비동기 구간의 지연이 늘어나는 만큼은 요청 처리 자체의 CPU 시간이고,
+동기 구간은 쿼리가 끝날 때까지 채팅이 통째로 멈춘다.
+
+    python bench_chat_latency.py --rows 200000 --concurrency 32 --seconds 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=100000, help="미리 채울 Neverball 기록 수")
+parser.add_argument("--concurrency", type=int, default=16, help="동시 랭킹 요청 수")
+parser.add_argument("--seconds", type=float, default=5.0, help="구간별 측정 시간")
+parser.add_argument("--interval-ms", type=float, default=10.0, help="채팅 메시지 전송 간격")
+args = parser.parse_args()
+
+# main을 가져오기 전에 임시 데이터베이스 지정
+workdir = tempfile.mkdtemp(prefix="bench_chat_")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/game_logs.db"
+os.environ.setdefault("CHAT_REPLAY_ON_CONNECT", "0")
+
+import httpx
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, insert, select
+
+import main
+
+LEVELS = 30
+USERS = 5000
+
+async def seed(rows: int):
+    async with main.engine.begin() as connection:
+        await connection.run_sync(main.create_tables)
+        start = datetime.now() - timedelta(days=30)
+        for offset in range(0, rows, 10000):
+            await connection.execute(insert(main.NeverballLog), [
+                {
+                    "username": f"user{random.randrange(USERS)}",
+                    "level": random.randrange(1, LEVELS + 1),
+                    "score": random.randrange(100000),
+                    "coins": random.randrange(300),
+                    "time": f"{random.randrange(10)}:{random.randrange(60):02d}",
+                    "is_anomaly": False,
+                    "created_at": start + timedelta(seconds=offset + i),
+                }
+                for i in range(min(10000, rows - offset))
+            ])
+
+class ChatClient:
+    """ASGI 앱에 직접 붙는 WebSocket 클라이언트 (네트워크 없이 이벤트 루프 지연만 측정)"""
+    def __init__(self, path: str):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.outbox: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws",
+            "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+            "headers": [], "subprotocols": [], "server": ("bench", 80), "client": ("127.0.0.1", 50000),
+        }
+        self.task = asyncio.create_task(main.app(scope, self.inbox.get, self.outbox.put))
+
+    async def connect(self):
+        await self.inbox.put({"type": "websocket.connect"})
+        event = await self.outbox.get()
+        assert event["type"] == "websocket.accept", event
+
+    async def send(self, data: dict):
+        await self.inbox.put({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def receive(self):
+        event = await self.outbox.get()
+        payload = json.loads(event["text"])
+        return payload if isinstance(payload, list) else [payload]
+
+    async def close(self):
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+async def measure_chat(client: ChatClient, seconds: float, interval: float) -> list:
+    """seconds 동안 interval마다 메시지를 보내고 자기 메시지가 돌아오기까지 걸린 시간(ms) 기록"""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    sequence = 0
+    while time.perf_counter() < deadline:
+        sequence += 1
+        started = time.perf_counter()
+        await client.send({"username": "bench", "message": str(sequence)})
+        while not any(m.get("message") == str(sequence) for m in await client.receive()):
+            pass
+        latencies.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+async def ranking_load(http: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    while not stop.is_set():
+        if random.random() < 0.2:
+            response = await http.get("/api/neverball/ranking-groups", params={"limit": 10})
+        else:
+            response = await http.get(f"/api/neverball/ranking/{random.randint(1, LEVELS)}", params={"limit": 50})
+        response.raise_for_status()
+        counter[0] += 1
+
+def blocking_queries():
+    """예전 동기 세션과 같은 방식의 쿼리 - 레벨별 랭킹과 ROW_NUMBER() 그룹 랭킹"""
+    model = main.NeverballLog
+    columns = main.entry_columns("neverball", main.GAMES["neverball"]["ranking_fields"])
+    level = select(*columns).where(model.level == random.randint(1, LEVELS)).order_by(*main.ranking_order("neverball")).limit(50)
+    group_rank = func.row_number().over(partition_by=model.level, order_by=main.ranking_order("neverball")).label("group_rank")
+    ranked = select(*columns, group_rank).subquery()
+    groups = select(ranked).where(ranked.c.group_rank <= 10)
+    return groups if random.random() < 0.2 else level
+
+async def blocking_load(sync_engine, stop: asyncio.Event, counter: list):
+    while not stop.is_set():
+        with sync_engine.connect() as connection:
+            connection.execute(blocking_queries()).mappings().all()
+        counter[0] += 1
+        await asyncio.sleep(0)
+
+async def measure_under_load(client: ChatClient, load, interval: float):
+    stop = asyncio.Event()
+    counter = [0]
+    workers = [asyncio.create_task(load(stop, counter)) for _ in range(args.concurrency)]
+    started = time.perf_counter()
+    latencies = await measure_chat(client, args.seconds, interval)
+    stop.set()
+    await asyncio.gather(*workers)
+    return latencies, counter[0] / (time.perf_counter() - started)
+
+def summary(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:>10}: {len(latencies):5d}회  p50 {statistics.median(latencies):7.2f} ms  "
+          f"p99 {p99:7.2f} ms  max {latencies[-1]:7.2f} ms")
+
+async def run():
+    print(f"📦 Neverball 기록 {args.rows}건 준비 중...")
+    await seed(args.rows)
+    for handler in main.app.router.on_startup:
+        await handler()
+
+    client = ChatClient("/ws/chat/bench")
+    await client.connect()
+    await client.receive()  # 접속자 수
+
+    interval = args.interval_ms / 1000
+    idle = await measure_chat(client, args.seconds, interval)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        loaded, loaded_rate = await measure_under_load(client, lambda stop, counter: ranking_load(http, stop, counter), interval)
+
+    sync_engine = create_engine(f"sqlite:///{workdir}/game_logs.db")
+    blocked, blocked_rate = await measure_under_load(client, lambda stop, counter: blocking_load(sync_engine, stop, counter), interval)
+    sync_engine.dispose()
+
+    await client.close()
+    for handler in main.app.router.on_shutdown:
+        await handler()
+
+    print(f"\n동시 랭킹 요청 {args.concurrency}개 - 비동기 {loaded_rate:.0f} req/s, 동기 엔진 {blocked_rate:.0f} req/s")
+    summary("부하 없음", idle)
+    summary("비동기 부하", loaded)
+    summary("동기 엔진", blocked)
+
+if __name__ == "__main__":
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+"""줄 단위 파서 처리량 측정 - 목표 초당 10만 줄 이상 (python bench_parser_throughput.py)
+
+Neverball 점수 파일과 ETR 하이스코어 형식의 합성 로그를 --lines줄 만들어
+LineParser.parse_lines가 초당 몇 줄을 처리하는지 잰다 (파일 읽기와 센서 확인 제외).
+--repeat번 반복한 중앙값 기준이다.
+
+    python bench_parser_throughput.py --lines 200000 --repeat 5
+"""
+import argparse
+import random
+import statistics
+import time
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--lines", type=int, default=200000, help="게임별 합성 로그 줄 수")
+parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+args = parser.parse_args()
+
+from parser import ETRParser, NeverballParser
+
+TARGET_LINES_PER_SECOND = 100000
+
+def neverball_lines() -> list:
+    """레벨 헤더 1줄 + 점수 10줄 (난이도 이름 줄 포함) 반복"""
+    lines = []
+    level = 0
+    while len(lines) < args.lines:
+        lines.append(f"level 0 0 map-easy/level{level:03d}.sol")
+        for index in range(10):
+            username = random.choice(("Hard", "Medium", "Easy")) if index < 3 else f"player{random.randrange(10000)}"
+            lines.append(f"{random.randrange(1000, 60000)} {random.randrange(100)} {username}")
+        level += 1
+    return lines[:args.lines]
+
+def etr_lines() -> list:
+    return [
+        f"  [course] bunny_hill_{index % 20} [plyr] player{random.randrange(10000)} "
+        f"[pts] {random.randrange(5000)} [herr] {random.randrange(50)} [time] {random.uniform(20, 300):.2f}"
+        for index in range(args.lines)
+    ]
+
+def measure(game_parser, lines: list) -> tuple:
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        records = sum(1 for _ in game_parser.parse_lines(lines, {}))
+        timings.append(time.perf_counter() - started)
+    return records, statistics.median(timings)
+
+def run():
+    random.seed(0)
+    print(f"게임별 {args.lines}줄, {args.repeat}회 반복 중앙값 (목표 {TARGET_LINES_PER_SECOND:,}줄/초)\n")
+    for game_parser, lines in ((NeverballParser(), neverball_lines()), (ETRParser(), etr_lines())):
+        records, elapsed = measure(game_parser, lines)
+        rate = len(lines) / elapsed
+        result = "달성" if rate >= TARGET_LINES_PER_SECOND else "미달"
+        print(f"{game_parser.title:>10}: 기록 {records:7d}개  {elapsed * 1000:8.1f} ms  {rate:10,.0f}줄/초  ({result})")
+
+if __name__ == "__main__":
+    run()
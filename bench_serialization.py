@@ -0,0 +1,95 @@
+"""랭킹 응답 직렬화 비용 비교 - 랭킹 1,000행 기준 (python bench_serialization.py)
+
+- 예전: ORM 객체 조회 → 행마다 dict 복사 + created_at.isoformat() → jsonable_encoder → json.dumps (JSONResponse)
+- 지금: 필요한 컬럼만 Core 행으로 조회 → ranking_entry → dump_json (orjson이 있으면 orjson)
+
+직렬화만 잰 값과 조회(SQLite 메모리 DB)까지 포함한 값을 함께 출력한다.
+
+    python bench_serialization.py --rows 1000 --repeat 200
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rows", type=int, default=1000, help="랭킹 행 수")
+parser.add_argument("--repeat", type=int, default=200, help="반복 횟수")
+args = parser.parse_args()
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+import main
+
+GAME = "neverball"
+model = main.GAMES[GAME]["model"]
+fields = main.GAMES[GAME]["ranking_fields"]
+
+# 예전 코드 (ORM 객체 → dict, created_at은 행마다 isoformat)
+def old_row_dict(log) -> dict:
+    return {column.name: getattr(log, column.name) for column in log.__table__.columns}
+
+def old_ranking_entry(values: dict) -> dict:
+    entry = {field: values[field] for field in fields}
+    entry["created_at"] = entry["created_at"].isoformat()
+    return entry
+
+def old_serialize(logs) -> bytes:
+    ranking = [{"rank": idx, **old_ranking_entry(old_row_dict(log))} for idx, log in enumerate(logs, 1)]
+    return JSONResponse(jsonable_encoder(ranking)).body
+
+def new_serialize(rows) -> bytes:
+    ranking = [{"rank": idx, **main.ranking_entry(GAME, row)} for idx, row in enumerate(rows, 1)]
+    return main.FastJSONResponse(ranking).body
+
+def measure(function) -> float:
+    """반복 실행 시간의 중앙값 (ms)"""
+    timings = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+def run():
+    engine = create_engine("sqlite://")
+    main.Base.metadata.create_all(engine)
+    start = datetime.now() - timedelta(days=1)
+    with engine.begin() as connection:
+        connection.execute(insert(model), [
+            {"username": f"user{i}", "level": random.randrange(1, 30), "score": random.randrange(100000),
+             "coins": random.randrange(300), "time": "1:23", "is_anomaly": False, "replay_filename": None,
+             "created_at": start + timedelta(seconds=i)}
+            for i in range(args.rows)
+        ])
+
+    order = main.ranking_order(GAME)
+    with Session(engine) as session:
+        def old_query():
+            session.expunge_all()
+            return session.execute(select(model).order_by(*order)).scalars().all()
+
+        def new_query():
+            return session.execute(select(*main.entry_columns(GAME, fields)).order_by(*order)).mappings().all()
+
+        logs, rows = old_query(), new_query()
+        assert len(logs) == len(rows) == args.rows
+
+        results = {
+            "직렬화만": (measure(lambda: old_serialize(logs)), measure(lambda: new_serialize(rows))),
+            "조회 + 직렬화": (measure(lambda: old_serialize(old_query())), measure(lambda: new_serialize(new_query()))),
+        }
+
+    print(f"랭킹 {args.rows}행, {args.repeat}회 반복 중앙값 (orjson {'사용' if main.ORJSON_AVAILABLE else '없음'})\n")
+    for name, (old, new) in results.items():
+        print(f"{name:>10}: 예전 {old:7.2f} ms  지금 {new:7.2f} ms  ({old / new:4.1f}배)")
+
+if __name__ == "__main__":
+    run()
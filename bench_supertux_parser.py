@@ -0,0 +1,103 @@
+"""SuperTux 저장 파일 파서 비교 - 스트리밍 토크나이저 vs 예전 정규식 (python bench_supertux_parser.py)
+
+합성 저장 파일(레벨 --levels개)을 세 가지로 만들어 비교한다.
+
+- 기본: 예전 정규식이 기대하는 순서 그대로 ("statistics" 안에 coins → secrets → time)
+- 합계 포함: SuperTux 0.6처럼 *-total 항목이 섞인 통계
+- 순서 다름: 통계 항목 순서가 바뀐 파일
+
+각 경우 찾은 레벨 수, 처리 시간, 최대 메모리(tracemalloc)를 출력한다.
+예전 정규식은 파일 전체를 한 번에 읽으므로 메모리가 파일 크기만큼 늘어난다.
+
+    python bench_supertux_parser.py --levels 50000
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--levels", type=int, default=20000, help="합성 저장 파일의 레벨 수")
+args = parser.parse_args()
+
+from parser import iter_supertux_levels, tokenize_sexp
+
+# 예전 parse_supertux_log의 정규식
+OLD_LEVEL_PATTERN = re.compile(
+    r'\("([^"]+\.stl)"\s+\(perfect\s+[^)]+\)\s+\("statistics"[^)]+\(coins-collected\s+(\d+)\)[^)]+\(secrets-found\s+(\d+)\)[^)]+\(time-needed\s+([\d.]+)\)',
+    re.DOTALL,
+)
+
+def level_block(index: int, layout: str) -> str:
+    coins, secrets, seconds = random.randrange(200), random.randrange(5), random.uniform(10, 300)
+    fields = {
+        "coins": f"(coins-collected {coins})",
+        "coins_total": f"(coins-collected-total {coins + random.randrange(50)})",
+        "secrets": f"(secrets-found {secrets})",
+        "secrets_total": f"(secrets-found-total {secrets + random.randrange(3)})",
+        "time": f"(time-needed {seconds:.2f})",
+        "badguys": f"(badguys-killed {random.randrange(40)})",
+    }
+    if layout == "기본":
+        order = ["coins", "secrets", "time"]
+    elif layout == "합계 포함":
+        order = ["coins", "coins_total", "badguys", "secrets", "secrets_total", "time"]
+    else:
+        order = ["time", "secrets", "badguys", "coins"]
+    statistics = "\n          ".join(fields[name] for name in order)
+    return (f'        ("level{index:05d}.stl"\n'
+            f'          (perfect #{"t" if random.random() < 0.3 else "f"})\n'
+            f'          ("statistics"\n          {statistics}\n          )\n'
+            f'          (solved #t)\n'
+            f'        )\n')
+
+def write_save(path: str, layout: str):
+    with open(path, "w") as f:
+        f.write('(supertux-worldmap\n  (levels\n    ("world1"\n')
+        for index in range(args.levels):
+            f.write(level_block(index, layout))
+        f.write('    )\n  )\n  (tux (x 10) (y 20) (back "west"))\n)\n')
+
+def parse_old(path: str) -> int:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        content = f.read()
+    # 예전 코드처럼 매치마다 레벨 dict를 만듦 (토크나이저 쪽과 같은 조건)
+    levels = [{"level": match.group(1), "coins": int(match.group(2)), "secrets": int(match.group(3)),
+               "time": float(match.group(4))} for match in OLD_LEVEL_PATTERN.finditer(content)]
+    return len(levels)
+
+def parse_new(path: str) -> int:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return sum(1 for _ in iter_supertux_levels(tokenize_sexp(f)))
+
+def measure(function, path: str) -> tuple:
+    started = time.perf_counter()
+    found = function(path)
+    elapsed = time.perf_counter() - started
+    # 메모리는 따로 측정 (tracemalloc이 실행 시간을 늘리므로)
+    tracemalloc.start()
+    function(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return found, elapsed, peak
+
+def run():
+    random.seed(0)
+    workdir = tempfile.mkdtemp(prefix="bench_supertux_")
+    print(f"레벨 {args.levels}개\n")
+    for layout in ("기본", "합계 포함", "순서 다름"):
+        path = os.path.join(workdir, f"{layout}.stsg")
+        write_save(path, layout)
+        size = os.path.getsize(path) / 1024 / 1024
+        print(f"[{layout}] {size:.1f} MiB")
+        for name, function in (("정규식", parse_old), ("토크나이저", parse_new)):
+            found, elapsed, peak = measure(function, path)
+            print(f"  {name:>6}: 레벨 {found:6d}개  {elapsed * 1000:8.1f} ms  최대 메모리 {peak / 1024 / 1024:6.2f} MiB")
+        os.unlink(path)
+    os.rmdir(workdir)
+
+if __name__ == "__main__":
+    run()
@@ -1,7 +1,16 @@
 import os
 import re
+import sys
+import json
+import ctypes
+import ctypes.util
+import select
+import struct
+import sqlite3
 import time
+import hashlib
 import requests
+from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 
@@ -15,13 +24,24 @@ except ImportError:
 
 # API URL
 API_BASE_URL = "http://localhost:8000/api"
+BULK_SEND_SIZE = 1000  # 한 번의 요청으로 보낼 최대 기록 수
 
-# 로그 파일 경로
-LOG_PATHS = {
-    "neverball": os.path.expanduser("~/.neverball/Scores/easy.txt"),
-    "supertux": os.path.expanduser("~/.local/share/supertux2/profile1/world1.stsg"),
-    "etr": os.path.expanduser("~/.config/etr/highscore")
-}
+# 추가된 부분만 읽기 (tail) - 파일별 읽은 위치를 상태 파일에 저장해서 재시작해도 이어서 읽음
+TAIL_MODE = os.getenv("PARSER_TAIL", "1") == "1"
+TAIL_STATE_FILE = os.path.expanduser("~/.notportable/parser_state.json")
+PREFIX_CHUNK_SIZE = 64 * 1024       # 이미 읽은 부분 체크섬 계산 시 한 번에 읽을 크기
+
+# 서버가 받은 기록의 지문(해시) 저장 - 재시작해도 이미 보낸 기록은 네트워크 전송 전에 제외
+FINGERPRINT_STORE = os.getenv("PARSER_FINGERPRINTS", "1") == "1"
+FINGERPRINT_DB = os.path.expanduser("~/.notportable/fingerprints.db")
+FINGERPRINT_LOOKUP_SIZE = 500       # IN 조회 한 번에 확인할 지문 수
+FINGERPRINT_MAX_ROWS = 200000       # compact 시 게임별로 남길 최대 지문 수 (최근 것부터)
+
+# 파일 감시 - inotify를 쓸 수 있으면 이벤트로, 아니면 mtime 폴링
+WATCH_MODE = os.getenv("PARSER_WATCH", "inotify")   # inotify | poll
+POLL_INTERVAL = 10          # 초 - 폴링 간격 (inotify 모드에서는 놓친 변경을 잡는 안전망)
+WATCH_DEBOUNCE = 0.2        # 초 - 마지막 이벤트 후 이만큼 조용하면 처리
+WATCH_DEBOUNCE_MAX = 1.0    # 초 - 이벤트가 계속 와도 최대 이만큼만 기다림
 
 # 초음파 센서 GPIO 핀
 TRIG_PIN = 23  # GPIO 23 (Physical Pin 16)
@@ -153,189 +173,510 @@ def check_anomaly():
     
     return False
 
-def parse_neverball_log(filepath):
+# 게임별 파서 (게임 이름 → 파서)
+PARSERS = {}
+
+def register_parser(cls):
+    """파서 클래스 등록 - 새 게임은 LineParser(줄 단위 로그) 또는 GameParser(그 외 형식)를 상속한 클래스에 이 데코레이터만 붙이면 됨"""
+    PARSERS[cls.game] = cls()
+    return cls
+
+class GameParser(ABC):
+    """
+    게임 로그 파서 기본 클래스 - 파일 전체를 읽는 형식
+    
+    하위 클래스는 parse_file을 구현하고 기록 dict를 하나씩 yield 한다 (is_anomaly는 기본 클래스에서 센서 값으로 채움).
+    """
+    game = None
+    title = None
+    path = None
+    dedup_fields = ()       # 서버 중복 판단 기준과 같은 필드 (지문 계산용, is_anomaly 제외)
+    line_based = False      # 줄 단위로 추가되는 로그면 True (tail 모드로 추가분만 읽음)
+    
+    @abstractmethod
+    def parse_file(self, f):
+        """열린 파일 전체 파싱"""
+    
+    def with_sensor(self, records):
+        for record in records:
+            # 센서로 이상 감지
+            record["is_anomaly"] = check_anomaly()
+            yield record
+    
+    def parse(self, filepath):
+        """로그 파일 전체 파싱"""
+        if not os.path.exists(filepath):
+            print(f"⚠️  {self.title} 로그 파일 없음: {filepath}")
+            return []
+        
+        try:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                logs = list(self.with_sensor(self.parse_file(f)))
+            print(f"📖 {self.title}: {len(logs)}개 기록 발견")
+            return logs
+        
+        except Exception as e:
+            print(f"❌ {self.title} 파싱 오류: {e}")
+            return []
+
+class LineParser(GameParser):
+    """
+    줄 단위 로그 파서 기본 클래스 - parse_lines를 구현하면 전체 파싱과 tail 모드 모두 지원
+    
+    목표 처리량: 초당 10만 줄 이상 (줄당 정규식 1회 - python bench_parser_throughput.py 로 확인)
+    """
+    line_based = True
+    
+    @abstractmethod
+    def parse_lines(self, lines, context):
+        """
+        줄 목록 파싱
+        context: 이전 묶음에서 이어지는 상태 - 파싱하면서 갱신됨
+        """
+    
+    def parse_file(self, f):
+        return self.parse_lines(f, {})
+    
+    def parse_appended(self, lines, context):
+        """tail 모드에서 새로 추가된 줄 파싱"""
+        return list(self.with_sensor(self.parse_lines(lines, context)))
+
+@register_parser
+class NeverballParser(LineParser):
     """
     Neverball 로그 파싱
-    형식: 2695 11 jungwooD
-         (시간ms) (코인수) (사용자명)
+    형식: level 0 0 map-easy/easy.sol   (레벨 헤더 - 세트 안 몇 번째 레벨인지가 기록의 level)
+         2695 11 jungwooD             (시간 1/100초) (코인수) (사용자명)
     """
-    if not os.path.exists(filepath):
-        print(f"⚠️  Neverball 로그 파일 없음: {filepath}")
-        return []
+    game = "neverball"
+    title = "Neverball"
+    path = os.path.expanduser("~/.neverball/Scores/easy.txt")
+    dedup_fields = ("username", "score", "coins", "time")
     
-    logs = []
-    current_level = "Unknown"
-    seen_records = set()  # 중복 체크용
+    # 레벨 줄(level ... 경로/레벨.sol) 또는 점수 줄 - 줄마다 정규식 1회
+    LINE = re.compile(r'\s*(?:level\s+\S+\s+\S+\s+(\S+)|(\d+)\s+(\d+)\s+(\S+)\s*$)')
+    DIFFICULTY_NAMES = {'Hard', 'Medium', 'Easy'}
     
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+    def parse_lines(self, lines, context):
+        seen_records = set()  # 중복 체크용
+        match_line = self.LINE.match
         
         for line in lines:
-            line = line.strip()
+            match = match_line(line)
+            if match is None:
+                continue
             
-            # 레벨 정보 추출
-            if line.startswith('level'):
-                parts = line.split()
-                if len(parts) >= 4:
-                    current_level = parts[3].split('/')[-1].replace('.sol', '')
+            level_path, time_cs, coins, username = match.groups()
+            if level_path is not None:
+                # 레벨 정보 (다음 묶음에서도 이어지도록 context에 저장)
+                context["current_level"] = level_path.split('/')[-1].replace('.sol', '')
+                context["level_number"] = context.get("level_number", 0) + 1
+                continue
             
-            # 점수 라인 파싱
-            match = re.match(r'^(\d+)\s+(\d+)\s+(\S+)$', line)
-            if match:
-                time_ms, coins, username = match.groups()
-                
-                if username not in ['Hard', 'Medium', 'Easy']:
-                    time_sec = int(time_ms) / 100.0
-                    minutes = int(time_sec // 60)
-                    seconds = int(time_sec % 60)
-                    time_str = f"{minutes:02d}:{seconds:02d}"
-                    
-                    # 중복 체크 (username, score, coins 조합으로)
-                    record_key = (username, int(time_ms), int(coins))
-                    if record_key in seen_records:
-                        continue
-                    seen_records.add(record_key)
-                    
-                    # 센서로 이상 감지
-                    is_anomaly = check_anomaly()
-                    
-                    logs.append({
-                        "username": username,
-                        "level": 1,
-                        "score": int(time_ms),
-                        "coins": int(coins),
-                        "time": time_str,
-                        "is_anomaly": is_anomaly
-                    })
-        
-        print(f"📖 Neverball: {len(logs)}개 기록 발견")
-        return logs
+            if username in self.DIFFICULTY_NAMES:
+                continue
+            
+            # 중복 체크 (username, score, coins 조합으로)
+            score = int(time_cs)
+            coins = int(coins)
+            record_key = (username, score, coins)
+            if record_key in seen_records:
+                continue
+            seen_records.add(record_key)
+            
+            minutes, seconds = divmod(score // 100, 60)
+            yield {
+                "username": username,
+                "level": context.get("level_number", 1),
+                "score": score,
+                "coins": coins,
+                "time": f"{minutes:02d}:{seconds:02d}",
+            }
+
+# S-expression 토큰: 공백, 주석, 괄호, 문자열, 그 외 원자(심볼/숫자/#t/#f)
+SEXP_TOKEN = re.compile(r'\s+|;[^\n]*|([()])|"((?:[^"\\]|\\.)*)"|([^\s()";]+)')
+SEXP_CHUNK_SIZE = 64 * 1024     # 한 번에 읽을 크기
+SEXP_MAX_TOKEN_SIZE = 64 * 1024  # 닫히지 않은 문자열 등 깨진 토큰을 버리는 기준
+# 레벨 안에서 값을 모을 항목 (statistics 안이든 밖이든 순서와 관계없이)
+SUPERTUX_LEVEL_FIELDS = {
+    "perfect", "solved",
+    "coins-collected", "coins-collected-total",
+    "secrets-found", "secrets-found-total",
+    "badguys-killed", "badguys-killed-total",
+    "time-needed",
+}
+
+def tokenize_sexp(f):
+    """
+    파일을 SEXP_CHUNK_SIZE씩 읽으며 토큰을 하나씩 반환 - 파일 크기와 관계없이 메모리 일정
+    토큰: "(" / ")" / ("string", 값) / ("atom", 값)
+    """
+    buffer = ""
+    while True:
+        chunk = f.read(SEXP_CHUNK_SIZE)
+        buffer += chunk
+        pos = 0
+        while pos < len(buffer):
+            match = SEXP_TOKEN.match(buffer, pos)
+            if match is None:
+                # 닫히지 않은 문자열 - 다음 조각을 기다리되 너무 길면 깨진 것으로 보고 건너뜀
+                if len(buffer) - pos > SEXP_MAX_TOKEN_SIZE or not chunk:
+                    pos += 1
+                    continue
+                break
+            if chunk and match.end() == len(buffer):
+                # 조각 끝에 걸친 토큰은 다음 조각과 합쳐서 처리
+                break
+            pos = match.end()
+            paren, string, atom = match.groups()
+            if paren:
+                yield paren
+            elif string is not None:
+                yield ("string", string.replace('\\"', '"').replace('\\\\', '\\'))
+            elif atom is not None:
+                yield ("atom", atom)
+        buffer = buffer[pos:]
+        if not chunk:
+            return
+
+def sexp_value(value):
+    if value == "#t":
+        return True
+    if value == "#f":
+        return False
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+def iter_supertux_levels(tokens):
+    """
+    SuperTux 저장 파일 토큰에서 레벨별 통계를 하나씩 반환
+    ("레벨.stl" (perfect #f) (statistics (coins-collected 3) ...)) 형태에서 항목 순서와 관계없이 수집
+    """
+    stack = []      # 열린 리스트마다 [첫 원소, 값 목록(최대 몇 개만)]
+    level = None    # [리스트 깊이, 레벨 이름, 수집한 항목]
     
-    except Exception as e:
-        print(f"❌ Neverball 파싱 오류: {e}")
-        return []
+    for token in tokens:
+        if token == "(":
+            stack.append([None, []])
+        elif token == ")":
+            if not stack:
+                continue
+            head, values = stack.pop()
+            if level is not None and len(stack) == level[0]:
+                stats = level[2]
+                if all(field in stats for field in ("coins-collected", "secrets-found", "time-needed")):
+                    yield {
+                        "level": level[1].replace('.stl', ''),
+                        "coins": stats["coins-collected"],
+                        "coins_total": stats.get("coins-collected-total"),
+                        "secrets": stats["secrets-found"],
+                        "secrets_total": stats.get("secrets-found-total"),
+                        "time": float(stats["time-needed"]),
+                        "perfect": stats.get("perfect", False),
+                        "solved": stats.get("solved", False),
+                    }
+                level = None
+            elif level is not None and head in SUPERTUX_LEVEL_FIELDS and values:
+                level[2][head] = sexp_value(values[0])
+        elif stack:
+            kind, value = token
+            frame = stack[-1]
+            if frame[0] is None:
+                frame[0] = value
+                if level is None and kind == "string" and value.endswith(".stl"):
+                    level = [len(stack) - 1, value, {}]
+            elif len(frame[1]) < 4:
+                frame[1].append(value)
 
-def parse_supertux_log(filepath):
-    """SuperTux 로그 파싱 (Lisp 형식)"""
-    if not os.path.exists(filepath):
-        print(f"⚠️  SuperTux 로그 파일 없음: {filepath}")
-        return []
+@register_parser
+class SuperTuxParser(GameParser):
+    """SuperTux 저장 파일 파싱 (Lisp 형식, 저장할 때마다 전체를 다시 씀)"""
+    game = "supertux"
+    title = "SuperTux"
+    path = os.path.expanduser("~/.local/share/supertux2/profile1/world1.stsg")
+    dedup_fields = ("username", "level", "coins", "secrets", "time")
     
-    logs = []
+    USERNAME_FILE = "/tmp/supertux_username.txt"   # C 런처에서 저장한 사용자 이름
     
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        level_pattern = r'\("([^"]+\.stl)"\s+\(perfect\s+[^)]+\)\s+\("statistics"[^)]+\(coins-collected\s+(\d+)\)[^)]+\(secrets-found\s+(\d+)\)[^)]+\(time-needed\s+([\d.]+)\)'
-        matches = re.finditer(level_pattern, content, re.DOTALL)
-        
-        # 사용자 이름 가져오기 (C 런처에서 저장한 파일)
+    def load_username(self):
         username = "Player"
-        username_file = "/tmp/supertux_username.txt"
-        if os.path.exists(username_file):
+        if os.path.exists(self.USERNAME_FILE):
             try:
-                with open(username_file, 'r') as f:
+                with open(self.USERNAME_FILE, 'r') as f:
                     saved_name = f.read().strip()
                     if saved_name:
                         username = saved_name
                         print(f"   👤 사용자: {username}")
             except:
                 pass
-        
-        for match in matches:
-            level_name, coins, secrets, time = match.groups()
-            level_name = level_name.replace('.stl', '')
-            
-            # 센서로 이상 감지
-            is_anomaly = check_anomaly()
-            
-            logs.append({
-                "username": username,
-                "level": level_name,
-                "coins": int(coins),
-                "secrets": int(secrets),
-                "time": float(time),
-                "is_anomaly": is_anomaly
-            })
-        
-        if logs:
-            print(f"📖 SuperTux: {len(logs)}개 기록 발견 (사용자: {username})")
-        return logs
+        return username
     
-    except Exception as e:
-        print(f"❌ SuperTux 파싱 오류: {e}")
-        return []
+    def parse_file(self, f):
+        username = self.load_username()
+        for stats in iter_supertux_levels(tokenize_sexp(f)):
+            yield {
+                "username": username,
+                "level": stats["level"],
+                "coins": stats["coins"],
+                "secrets": stats["secrets"],
+                "time": stats["time"],
+            }
 
-def parse_etr_log(filepath):
-    """ETR 로그 파싱"""
-    if not os.path.exists(filepath):
-        print(f"⚠️  ETR 로그 파일 없음: {filepath}")
-        return []
+@register_parser
+class ETRParser(LineParser):
+    """ETR 하이스코어 파싱 - [course] ... [plyr] ... [pts] ... [herr] ... [time] ..."""
+    game = "etr"
+    title = "ETR"
+    path = os.path.expanduser("~/.config/etr/highscore")
+    dedup_fields = ("username", "course", "score", "herring", "time")
     
-    logs = []
+    # [키] 값 쌍 - 줄마다 정규식 1회로 모든 필드 추출
+    FIELD = re.compile(r'\[(\w+)\]\s+(\S+)')
+    REQUIRED = ("course", "plyr", "pts", "herr", "time")
     
-    try:
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
+    def parse_lines(self, lines, context):
+        find_fields = self.FIELD.findall
         
         for line in lines:
-            course_match = re.search(r'\[course\]\s+(\S+)', line)
-            plyr_match = re.search(r'\[plyr\]\s+(\S+)', line)
-            pts_match = re.search(r'\[pts\]\s+(\d+)', line)
-            herr_match = re.search(r'\[herr\]\s+(\d+)', line)
-            time_match = re.search(r'\[time\]\s+([\d.]+)', line)
+            fields = dict(find_fields(line))
+            if not all(key in fields for key in self.REQUIRED):
+                continue
+            try:
+                score = int(fields["pts"])
+                herring = int(fields["herr"])
+                time_sec = float(fields["time"])
+            except ValueError:
+                continue
             
-            if all([course_match, plyr_match, pts_match, herr_match, time_match]):
-                course = course_match.group(1).replace('_', ' ')
-                username = plyr_match.group(1)
-                score = int(pts_match.group(1))
-                herring = int(herr_match.group(1))
-                time_sec = float(time_match.group(1))
-                
-                minutes = int(time_sec // 60)
-                seconds = time_sec % 60
-                time_str = f"{minutes:02d}:{seconds:05.2f}"
-                
-                # 센서로 이상 감지
-                is_anomaly = check_anomaly()
-                
-                logs.append({
-                    "username": username,
-                    "course": course,
-                    "score": score,
-                    "herring": herring,
-                    "time": time_str,
-                    "is_anomaly": is_anomaly
-                })
+            minutes = int(time_sec // 60)
+            seconds = time_sec % 60
+            yield {
+                "username": fields["plyr"],
+                "course": fields["course"].replace('_', ' '),
+                "score": score,
+                "herring": herring,
+                "time": f"{minutes:02d}:{seconds:05.2f}",
+            }
+
+# 로그 파일 경로 (등록된 파서 기준)
+LOG_PATHS = {game: parser.path for game, parser in PARSERS.items()}
+
+def load_tail_state():
+    """파일별 읽은 위치 불러오기 - {경로: {inode, offset, size, mtime, checksum, context}}"""
+    try:
+        with open(TAIL_STATE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_tail_state(state):
+    # 임시 파일에 쓰고 교체해서 중간에 종료돼도 상태 파일이 깨지지 않음
+    os.makedirs(os.path.dirname(TAIL_STATE_FILE), exist_ok=True)
+    tmp_path = TAIL_STATE_FILE + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, TAIL_STATE_FILE)
+
+def prefix_checksum(f, length):
+    """파일 앞 length 바이트의 체크섬 - 이어서 update 할 수 있도록 해시 객체를 반환"""
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = length
+    while remaining > 0:
+        chunk = f.read(min(PREFIX_CHUNK_SIZE, remaining))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+def read_appended_lines(filepath, entry):
+    """
+    마지막으로 읽은 위치 이후에 추가된 완성된 줄만 읽기
+    반환: (줄 목록, 이어지는 context, 새 상태) - 바뀐 게 없으면 줄 목록이 비어 있음
+    
+    inode가 바뀌었거나(로테이션) 파일이 줄었거나(truncate) 이미 읽은 부분이 달라졌으면(새로 씀) 처음부터 다시 읽음
+    이미 읽은 부분(offset까지) 전체의 체크섬을 비교하므로 앞부분이 아닌 중간에 끼워 넣은 기록도 감지함
+    크기가 그대로인데 수정 시각이 바뀌었으면 같은 크기로 새로 쓴 것이므로 역시 처음부터 다시 읽음
+    (Neverball/ETR 점수 파일은 덧붙이지 않고 정렬된 표를 통째로 다시 씀 - 이미 보낸 기록은 지문 저장소/서버 중복 체크로 걸러짐)
+    """
+    with open(filepath, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        offset = 0
+        context = {}
+        digest = None
         
-        print(f"📖 ETR: {len(logs)}개 기록 발견")
-        return logs
+        if entry and entry["inode"] == stat.st_ino and stat.st_size >= entry["offset"]:
+            same_size = stat.st_size == entry["size"]
+            if same_size and stat.st_mtime_ns != entry.get("mtime"):
+                print(f"🔄 같은 크기로 새로 써짐 - 처음부터 다시 읽음: {filepath}")
+            elif same_size and entry["offset"] == entry["size"]:
+                return [], entry["context"], entry
+            else:
+                digest = prefix_checksum(f, entry["offset"])
+                if digest.hexdigest() == entry.get("checksum"):
+                    offset = entry["offset"]
+                    context = entry["context"]
+                else:
+                    print(f"🔄 파일이 새로 써짐 - 처음부터 다시 읽음: {filepath}")
+                    digest = None
+        elif entry:
+            print(f"🔄 파일 교체/잘림 감지 - 처음부터 다시 읽음: {filepath}")
+        
+        f.seek(offset)
+        data = f.read()
+    
+    # 마지막 줄바꿈까지만 처리 (쓰는 중인 줄은 다음에)
+    data = data[:data.rfind(b"\n") + 1]
+    end = offset + len(data)
+    if digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+    digest.update(data)
     
+    lines = data.decode('utf-8', errors='ignore').splitlines()
+    new_entry = {
+        "inode": stat.st_ino,
+        "offset": end,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "checksum": digest.hexdigest(),
+        "context": context,
+    }
+    return lines, context, new_entry
+
+def tail_log(game, filepath, state):
+    """추가된 기록만 파싱해서 전송 - 전송에 성공해야 읽은 위치를 저장"""
+    if not os.path.exists(filepath):
+        print(f"⚠️  {game} 로그 파일 없음: {filepath}")
+        return
+    
+    try:
+        lines, context, entry = read_appended_lines(filepath, state.get(filepath))
+        logs = PARSERS[game].parse_appended(lines, context)
     except Exception as e:
-        print(f"❌ ETR 파싱 오류: {e}")
-        return []
+        print(f"❌ {game} 파싱 오류: {e}")
+        return
+    
+    if logs:
+        print(f"📖 {game}: 새 기록 {len(logs)}개")
+        if not send_to_api(game, logs):
+            return
+    
+    entry["context"] = context
+    state[filepath] = entry
+    save_tail_state(state)
+
+fingerprint_db = None
+
+def get_fingerprint_db():
+    """지문 DB 연결 (처음 사용할 때 열고 테이블 생성)"""
+    global fingerprint_db
+    if fingerprint_db is None:
+        os.makedirs(os.path.dirname(FINGERPRINT_DB), exist_ok=True)
+        fingerprint_db = sqlite3.connect(FINGERPRINT_DB)
+        fingerprint_db.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                game TEXT NOT NULL,
+                hash BLOB NOT NULL,
+                acked_at INTEGER NOT NULL,
+                PRIMARY KEY (game, hash)
+            ) WITHOUT ROWID
+        """)
+        fingerprint_db.execute("CREATE INDEX IF NOT EXISTS ix_fingerprints_acked ON fingerprints (game, acked_at)")
+    return fingerprint_db
+
+def record_fingerprint(game, record):
+    values = [record[field] for field in PARSERS[game].dedup_fields]
+    return hashlib.blake2b(json.dumps(values).encode(), digest_size=16).digest()
+
+def filter_new_records(game, logs):
+    """서버가 이미 받은 기록 제외 - 지문은 묶음 단위 IN 조회로 확인 (전체를 메모리에 올리지 않음)"""
+    if not FINGERPRINT_STORE or not logs:
+        return logs
+    
+    db = get_fingerprint_db()
+    hashes = [record_fingerprint(game, record) for record in logs]
+    known = set()
+    for start in range(0, len(hashes), FINGERPRINT_LOOKUP_SIZE):
+        chunk = hashes[start:start + FINGERPRINT_LOOKUP_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        rows = db.execute(
+            f"SELECT hash FROM fingerprints WHERE game = ? AND hash IN ({placeholders})", [game, *chunk]
+        )
+        known.update(row[0] for row in rows)
+    return [record for record, digest in zip(logs, hashes) if digest not in known]
+
+def remember_records(game, records):
+    """서버가 저장했거나 중복으로 확인한 기록의 지문 저장"""
+    if not FINGERPRINT_STORE or not records:
+        return
+    db = get_fingerprint_db()
+    now = int(time.time())
+    with db:
+        db.executemany(
+            "INSERT OR REPLACE INTO fingerprints (game, hash, acked_at) VALUES (?, ?, ?)",
+            [(game, record_fingerprint(game, record), now) for record in records],
+        )
+
+def compact_fingerprints():
+    """게임별로 최근 FINGERPRINT_MAX_ROWS개만 남기고 파일 크기 정리 (python parser.py compact)"""
+    db = get_fingerprint_db()
+    for game in PARSERS:
+        with db:
+            deleted = db.execute("""
+                DELETE FROM fingerprints WHERE game = ? AND hash NOT IN (
+                    SELECT hash FROM fingerprints WHERE game = ? ORDER BY acked_at DESC LIMIT ?
+                )
+            """, (game, game, FINGERPRINT_MAX_ROWS)).rowcount
+        remaining = db.execute("SELECT COUNT(*) FROM fingerprints WHERE game = ?", (game,)).fetchone()[0]
+        print(f"🧹 {game}: {deleted}개 삭제, {remaining}개 유지")
+    db.execute("VACUUM")
+    print(f"✅ 지문 DB 정리 완료: {FINGERPRINT_DB} ({os.path.getsize(FINGERPRINT_DB)} bytes)")
 
 def send_to_api(game, logs):
-    """API로 로그 전송 (중복 체크 포함)"""
+    """API로 로그 일괄 전송 (중복 체크는 서버에서 처리) - 모든 묶음이 서버에 전달됐으면 True"""
+    delivered = True
     success_count = 0
     anomaly_count = 0
     duplicate_count = 0
     
-    for log in logs:
+    # 이전에 서버가 받은 기록은 보내지 않음
+    total_count = len(logs)
+    logs = filter_new_records(game, logs)
+    skipped_count = total_count - len(logs)
+    if skipped_count > 0:
+        print(f"⏭️  [{game}] 이미 전송된 기록 {skipped_count}개 제외")
+    
+    for start in range(0, len(logs), BULK_SEND_SIZE):
+        batch = logs[start:start + BULK_SEND_SIZE]
         try:
-            response = requests.post(f"{API_BASE_URL}/{game}/log", json=log)
-            if response.status_code == 200:
-                success_count += 1
-                if log.get('is_anomaly'):
-                    anomaly_count += 1
-            elif response.status_code == 409:  # Conflict - 중복
-                duplicate_count += 1
-            else:
+            response = requests.post(f"{API_BASE_URL}/{game}/logs/bulk", json=batch)
+            if response.status_code != 200:
                 print(f"❌ [{game}] API 오류: {response.status_code}")
+                delivered = False
+                continue
+            
+            acknowledged = []
+            for result in response.json()["results"]:
+                if result["status"] == "inserted":
+                    success_count += 1
+                    acknowledged.append(batch[result["index"]])
+                    if batch[result["index"]].get('is_anomaly'):
+                        anomaly_count += 1
+                elif result["status"] == "duplicate":
+                    duplicate_count += 1
+                    acknowledged.append(batch[result["index"]])
+                else:
+                    print(f"❌ [{game}] 잘못된 기록: {result.get('error')}")
+            remember_records(game, acknowledged)
         except Exception as e:
             print(f"❌ [{game}] 전송 실패: {e}")
+            delivered = False
     
     if success_count > 0 or duplicate_count > 0:
         status = f"✅ [{game}]"
@@ -346,6 +687,120 @@ def send_to_api(game, logs):
         if anomaly_count > 0:
             status += f" (🚨 이상 데이터 {anomaly_count}개)"
         print(status)
+    return delivered
+
+# inotify 이벤트 (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")   # wd, mask, cookie, len
+
+class InotifyWatcher:
+    """
+    로그 파일이 있는 디렉터리를 inotify로 감시 (ctypes로 libc 직접 호출)
+    게임이 파일을 새로 만들거나 임시 파일로 쓰고 이름을 바꿔도 잡히도록 파일이 아니라 부모 디렉터리를 감시
+    """
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 실패")
+        
+        self.targets = {}   # wd → {파일 이름: 게임}
+        for game, path in paths.items():
+            directory, name = os.path.split(path)
+            if not os.path.isdir(directory):
+                print(f"⚠️  {game} 디렉터리 없음 - 폴링으로 확인: {directory}")
+                continue
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE)
+            if wd < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch 실패: {directory}")
+            self.targets.setdefault(wd, {})[name] = game
+    
+    def read_games(self):
+        """쌓인 이벤트를 모두 읽고 변경된 게임 목록 반환"""
+        games = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return games
+            
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0").decode(errors="ignore")
+                offset += length
+                
+                if mask & IN_Q_OVERFLOW:
+                    # 이벤트가 넘쳐서 일부를 잃었으면 전부 확인
+                    for names in self.targets.values():
+                        games.update(names.values())
+                elif name in self.targets.get(wd, {}):
+                    games.add(self.targets[wd][name])
+    
+    def wait(self, timeout):
+        """
+        변경된 게임 목록 반환 (timeout 동안 이벤트가 없으면 빈 집합)
+        연달아 오는 이벤트는 WATCH_DEBOUNCE 동안 조용해질 때까지 모아서 한 번에 처리
+        """
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        
+        games = self.read_games()
+        deadline = time.monotonic() + WATCH_DEBOUNCE_MAX
+        while time.monotonic() < deadline:
+            if not select.select([self.fd], [], [], WATCH_DEBOUNCE)[0]:
+                break
+            games |= self.read_games()
+        return games
+    
+    def close(self):
+        os.close(self.fd)
+
+def create_watcher():
+    """inotify 감시 시작 - 쓸 수 없는 환경이면 None (폴링으로 동작)"""
+    if WATCH_MODE != "inotify":
+        return None
+    try:
+        return InotifyWatcher(LOG_PATHS)
+    except (OSError, AttributeError) as e:
+        # AttributeError: libc에 inotify 함수가 없음 (리눅스가 아님)
+        print(f"⚠️  inotify 사용 불가 - {POLL_INTERVAL}초 폴링으로 동작: {e}")
+        return None
+
+def process_log(game, path, tail_state):
+    """로그 파일 1개 파싱 후 전송"""
+    parser = PARSERS[game]
+    if TAIL_MODE and parser.line_based:
+        tail_log(game, path, tail_state)
+        return
+    
+    logs = parser.parse(path)
+    if logs:
+        send_to_api(game, logs)
+
+def process_change(game, path, tail_state):
+    """변경된 로그 처리 후 파일 기록 시각부터 API 전송 완료까지 걸린 시간 출력"""
+    print(f"\n🔄 {game} 로그 파일 변경 감지!")
+    process_log(game, path, tail_state)
+    if os.path.exists(path):
+        latency_ms = (time.time() - os.path.getmtime(path)) * 1000
+        print(f"⏱️  [{game}] 파일 기록 → API 전송 완료: {latency_ms:.0f}ms")
+
+def check_mtimes(last_modified, tail_state):
+    """mtime이 바뀐 로그 처리 (폴링)"""
+    for game, path in LOG_PATHS.items():
+        if os.path.exists(path):
+            current_mtime = os.path.getmtime(path)
+            if current_mtime > last_modified[game]:
+                last_modified[game] = current_mtime
+                process_change(game, path, tail_state)
 
 def cleanup_sensor():
     """센서 정리"""
@@ -360,9 +815,8 @@ def main():
     """메인 루프"""
     print("🎮 NotPortable 로그 파서 with 초음파 센서")
     print("=" * 60)
-    print(f"📁 Neverball: {LOG_PATHS['neverball']}")
-    print(f"📁 SuperTux: {LOG_PATHS['supertux']}")
-    print(f"📁 ETR: {LOG_PATHS['etr']}")
+    for parser in PARSERS.values():
+        print(f"📁 {parser.title}: {parser.path}")
     print("=" * 60)
     
     # 초음파 센서 초기화
@@ -383,24 +837,23 @@ def main():
         print("\n⚠️  센서 비활성화 - lgpio 설치 필요:")
         print("   sudo apt install python3-lgpio\n")
     
-    print("🔄 10초마다 로그 확인 중...\n")
+    watcher = create_watcher()
+    if watcher:
+        print("🔄 inotify로 로그 변경 감시 중...\n")
+    else:
+        print(f"🔄 {POLL_INTERVAL}초마다 로그 확인 중...\n")
     
-    # 처음 실행시 모든 로그 파싱
+    # tail 모드면 지난번 읽은 위치 이후만, 아니면 모든 로그 파싱
+    tail_state = load_tail_state() if TAIL_MODE else {}
     print("=" * 60)
-    print("첫 실행: 모든 로그 파싱 중...")
+    if TAIL_MODE and tail_state:
+        print("지난 실행 이후 추가된 로그 파싱 중...")
+    else:
+        print("첫 실행: 모든 로그 파싱 중...")
     print("=" * 60)
     
-    neverball_logs = parse_neverball_log(LOG_PATHS["neverball"])
-    if neverball_logs:
-        send_to_api("neverball", neverball_logs)
-    
-    supertux_logs = parse_supertux_log(LOG_PATHS["supertux"])
-    if supertux_logs:
-        send_to_api("supertux", supertux_logs)
-    
-    etr_logs = parse_etr_log(LOG_PATHS["etr"])
-    if etr_logs:
-        send_to_api("etr", etr_logs)
+    for game, path in LOG_PATHS.items():
+        process_log(game, path, tail_state)
     
     print("\n" + "=" * 60)
     print("초기 로딩 완료! 새 로그 감시 시작...")
@@ -408,31 +861,30 @@ def main():
     
     # 파일 수정 시간 추적
     last_modified = {
-        "neverball": os.path.getmtime(LOG_PATHS["neverball"]) if os.path.exists(LOG_PATHS["neverball"]) else 0,
-        "supertux": os.path.getmtime(LOG_PATHS["supertux"]) if os.path.exists(LOG_PATHS["supertux"]) else 0,
-        "etr": os.path.getmtime(LOG_PATHS["etr"]) if os.path.exists(LOG_PATHS["etr"]) else 0
+        game: os.path.getmtime(path) if os.path.exists(path) else 0
+        for game, path in LOG_PATHS.items()
     }
     
+    # 감시하지 못한 디렉터리(아직 없던 경로 등)는 이벤트와 관계없이 POLL_INTERVAL마다 폴링으로 확인
+    # (감시 중인 게임 로그가 계속 바뀌어도 다른 게임 확인이 밀리지 않도록 다음 폴링 시각을 따로 관리)
+    next_poll = time.monotonic() + POLL_INTERVAL
     try:
         while True:
-            for game, path in LOG_PATHS.items():
+            if watcher is None:
+                check_mtimes(last_modified, tail_state)
+                time.sleep(POLL_INTERVAL)
+                continue
+            
+            games = watcher.wait(max(0.0, next_poll - time.monotonic()))
+            for game in sorted(games):
+                path = LOG_PATHS[game]
                 if os.path.exists(path):
-                    current_mtime = os.path.getmtime(path)
-                    if current_mtime > last_modified[game]:
-                        print(f"\n🔄 {game} 로그 파일 변경 감지!")
-                        last_modified[game] = current_mtime
-                        
-                        if game == "neverball":
-                            logs = parse_neverball_log(path)
-                        elif game == "supertux":
-                            logs = parse_supertux_log(path)
-                        elif game == "etr":
-                            logs = parse_etr_log(path)
-                        
-                        if logs:
-                            send_to_api(game, logs)
+                    last_modified[game] = os.path.getmtime(path)
+                    process_change(game, path, tail_state)
             
-            time.sleep(10)
+            if time.monotonic() >= next_poll:
+                check_mtimes(last_modified, tail_state)
+                next_poll = time.monotonic() + POLL_INTERVAL
             
     except KeyboardInterrupt:
         print("\n\n👋 로그 파서 종료")
@@ -440,6 +892,12 @@ def main():
     except Exception as e:
         print(f"\n⚠️  오류 발생: {e}")
         cleanup_sensor()
+    finally:
+        if watcher:
+            watcher.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if sys.argv[1:] == ["compact"]:
+        compact_fingerprints()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,246 @@
+"""
+채팅 브로드캐스트용 pub/sub 백엔드
+
+- InProcessBackend: 워커 1개일 때 (기본값)
+- UnixSocketBackend: 같은 머신의 여러 uvicorn 워커가 Unix 소켓 브로커로 메시지와 접속자 수 공유
+  브로커는 별도 서비스 없이 워커 중 하나가 잠금 파일을 잡아서 띄우고,
+  그 워커가 종료되면 남은 워커가 다시 브로커를 맡는다.
+
+  CHAT_BACKEND=unix uvicorn main:app --workers 4
+"""
+import asyncio
+import fcntl
+import json
+import os
+from typing import Callable, Dict, Optional
+
+# 브로커 연결 재시도 간격 (초)
+RECONNECT_INTERVAL = 0.5
+# 브로커가 워커 1개에 쌓아둘 최대 송신 버퍼 (넘치면 해당 워커 연결 종료)
+MAX_WORKER_BUFFER = 4 * 1024 * 1024
+# 한 줄(메시지 1개) 최대 크기
+MAX_LINE_SIZE = 1024 * 1024
+
+
+class InProcessBackend:
+    """워커 1개용 - 발행한 메시지를 바로 로컬 핸들러로 전달"""
+
+    def __init__(self):
+        self.handler: Optional[Callable[[str, dict], None]] = None
+        self.on_resync: Optional[Callable[[], None]] = None
+        self.counts: Dict[str, int] = {}
+
+    async def start(self, handler: Callable[[str, dict], None], on_resync: Optional[Callable[[], None]] = None):
+        """handler: 채널 메시지 수신, on_resync: 메시지를 놓쳤을 수 있어 상태를 다시 읽어야 할 때"""
+        self.handler = handler
+        self.on_resync = on_resync
+
+    async def stop(self):
+        pass
+
+    def publish(self, channel: str, message: dict):
+        self.handler(channel, message)
+
+    def set_count(self, channel: str, count: int):
+        """이 워커의 채널별 접속자 수"""
+        self.counts[channel] = count
+
+    def total_count(self, channel: str) -> int:
+        return self.counts.get(channel, 0)
+
+    def get_stats(self) -> dict:
+        return {"backend": "memory"}
+
+
+class UnixSocketBackend(InProcessBackend):
+    """여러 워커용 - Unix 소켓 브로커를 거쳐 다른 워커에도 메시지 전달
+
+    브로커 프로토콜은 줄 단위 JSON:
+      {"op": "publish", "channel": ..., "message": {...}}
+      {"op": "count", "worker": ..., "channel": ..., "count": n}
+      {"op": "leave", "worker": ...}
+      {"op": "resync"}   브로커 연결이 끊긴 동안 발행하지 못한 메시지가 있음 - 받은 워커는 상태를 다시 읽음
+
+    브로커 연결이 끊기면 그동안의 메시지는 전달되지 않는다 (밀린 워커는 브로커가 연결을 끊음).
+    다시 연결되면 on_resync로 알리고, 보내지 못한 메시지가 있었으면 다른 워커에도 resync를 요청한다.
+    """
+
+    def __init__(self, socket_path: str):
+        super().__init__()
+        self.socket_path = socket_path
+        self.lock_path = socket_path + ".lock"
+        self.worker_id = f"{os.uname().nodename}:{os.getpid()}"
+        self.remote_counts: Dict[str, Dict[str, int]] = {}   # worker → channel → 접속자 수
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.task: Optional[asyncio.Task] = None
+        self.lock_fd: Optional[int] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.broker_writers: Dict[asyncio.StreamWriter, Optional[str]] = {}
+        self.broker_counts: Dict[str, Dict[str, int]] = {}
+        self.connected_once = False
+        self.dropped_publishes = 0   # 연결이 끊긴 동안 보내지 못한 발행 메시지 수
+        self.reconnects = 0
+
+    async def start(self, handler: Callable[[str, dict], None], on_resync: Optional[Callable[[], None]] = None):
+        self.handler = handler
+        self.on_resync = on_resync
+        self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+        if self.writer:
+            self.writer.close()
+        if self.server:
+            self.server.close()
+            for writer in list(self.broker_writers):
+                writer.close()
+        if self.lock_fd is not None:
+            os.close(self.lock_fd)
+            self.lock_fd = None
+
+    def publish(self, channel: str, message: dict):
+        # 자기 워커는 바로 전달하고 브로커는 다른 워커에만 중계
+        self.handler(channel, message)
+        self.send({"op": "publish", "channel": channel, "message": message})
+
+    def set_count(self, channel: str, count: int):
+        self.counts[channel] = count
+        self.send({"op": "count", "worker": self.worker_id, "channel": channel, "count": count})
+
+    def total_count(self, channel: str) -> int:
+        remote = sum(counts.get(channel, 0) for counts in self.remote_counts.values())
+        return self.counts.get(channel, 0) + remote
+
+    def get_stats(self) -> dict:
+        return {
+            "backend": "unix",
+            "socket_path": self.socket_path,
+            "connected": self.writer is not None,
+            "is_broker": self.server is not None,
+            "workers": len(self.remote_counts) + 1,
+            "reconnects": self.reconnects,
+        }
+
+    def send(self, frame: dict):
+        if self.writer is None:
+            if frame["op"] == "publish":
+                self.dropped_publishes += 1
+            return
+        self.writer.write(json.dumps(frame, ensure_ascii=False).encode() + b"\n")
+
+    # 워커 쪽 연결
+    async def run(self):
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_LINE_SIZE)
+            except OSError:
+                await self.try_become_broker()
+                await asyncio.sleep(RECONNECT_INTERVAL)
+                continue
+
+            self.writer = writer
+            # 재연결 시 현재 접속자 수 다시 알림
+            for channel, count in self.counts.items():
+                self.set_count(channel, count)
+            # 끊긴 동안 다른 워커가 발행한 메시지를 놓쳤으므로 이 워커 상태 재동기화
+            if self.connected_once:
+                self.reconnects += 1
+                self.resync()
+            self.connected_once = True
+            # 이 워커가 보내지 못한 메시지는 다른 워커가 놓쳤으므로 재동기화 요청
+            if self.dropped_publishes:
+                self.dropped_publishes = 0
+                self.send({"op": "resync"})
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    try:
+                        self.receive(json.loads(line))
+                    except Exception as e:
+                        # 메시지 1개 처리 실패로 수신 태스크가 끝나면 이후 메시지가 모두 사라짐
+                        print(f"❌ 브로커 메시지 처리 실패: {e!r}")
+            except (OSError, ValueError):
+                pass
+            finally:
+                self.writer = None
+                self.remote_counts.clear()
+                writer.close()
+
+    def receive(self, frame: dict):
+        op = frame.get("op")
+        if op == "publish":
+            self.handler(frame["channel"], frame["message"])
+        elif op == "count":
+            self.remote_counts.setdefault(frame["worker"], {})[frame["channel"]] = frame["count"]
+        elif op == "leave":
+            self.remote_counts.pop(frame["worker"], None)
+        elif op == "resync":
+            self.resync()
+
+    def resync(self):
+        if self.on_resync is not None:
+            self.on_resync()
+
+    # 브로커
+    async def try_become_broker(self):
+        """잠금 파일을 잡은 워커 하나만 브로커 실행"""
+        if self.server is not None:
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return
+
+        self.lock_fd = fd
+        # 이전 브로커가 남긴 소켓 파일 정리
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        self.server = await asyncio.start_unix_server(self.serve_worker, self.socket_path, limit=MAX_LINE_SIZE)
+        print(f"✅ 채팅 브로커 시작: {self.socket_path}")
+
+    async def serve_worker(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.broker_writers[writer] = None
+        # 새 워커에 현재 접속자 수 전달
+        for worker, counts in self.broker_counts.items():
+            for channel, count in counts.items():
+                self.relay({"op": "count", "worker": worker, "channel": channel, "count": count}, only=writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                frame = json.loads(line)
+                if frame.get("op") == "count":
+                    self.broker_writers[writer] = frame["worker"]
+                    self.broker_counts.setdefault(frame["worker"], {})[frame["channel"]] = frame["count"]
+                self.relay(frame, exclude=writer)
+        except (OSError, ValueError):
+            pass
+        finally:
+            worker = self.broker_writers.pop(writer, None)
+            writer.close()
+            if worker is not None:
+                self.broker_counts.pop(worker, None)
+                self.relay({"op": "leave", "worker": worker})
+
+    def relay(self, frame: dict, exclude=None, only=None):
+        data = json.dumps(frame, ensure_ascii=False).encode() + b"\n"
+        for writer in ([only] if only else list(self.broker_writers)):
+            if writer is exclude:
+                continue
+            # 읽지 못하고 밀린 워커는 연결 종료 (재접속 후 다시 동기화)
+            if writer.transport.get_write_buffer_size() > MAX_WORKER_BUFFER:
+                writer.close()
+                continue
+            writer.write(data)
+
+
+def create_backend(name: str, socket_path: str):
+    if name == "unix":
+        return UnixSocketBackend(socket_path)
+    return InProcessBackend()
@@ -0,0 +1,67 @@
+"""parser.py tail 모드 테스트 (python -m pytest test_parser.py)"""
+import os
+
+from parser import NeverballParser, read_appended_lines
+
+LEVELS = 20
+SCORES_PER_LEVEL = 12
+
+
+def score_table(extra=None) -> str:
+    """Neverball 점수 파일 - extra가 있으면 마지막 레벨 표 중간에 끼워 넣음 (정렬된 표를 통째로 다시 쓴 것과 같음)"""
+    lines = []
+    for level in range(LEVELS):
+        lines.append(f"level 0 0 map-easy/level{level:02d}.sol")
+        scores = [f"{3000 + index * 7} {index} player{level}_{index}" for index in range(SCORES_PER_LEVEL)]
+        if extra and level == LEVELS - 1:
+            scores.insert(SCORES_PER_LEVEL // 2, extra)
+        lines.extend(scores)
+    return "\n".join(lines) + "\n"
+
+
+def write(path, content: str):
+    # 같은 파일(inode)에 덮어씀 - 게임이 점수 파일을 다시 쓰는 방식
+    with open(path, "r+" if os.path.exists(path) else "w") as f:
+        f.write(content)
+        f.truncate()
+
+
+def test_rewrite_past_the_head_is_read_from_start(tmp_path):
+    path = tmp_path / "easy.txt"
+    write(path, score_table())
+    assert os.path.getsize(path) > 4096
+
+    lines, context, entry = read_appended_lines(str(path), None)
+    assert len(list(NeverballParser().parse_appended(lines, context))) == LEVELS * SCORES_PER_LEVEL
+
+    # 앞 4 KiB는 그대로이고 파일은 커짐 - 뒤에 덧붙인 것처럼 보이지만 중간에 끼워 넣은 것
+    write(path, score_table(extra="9008 8 newcomer"))
+    lines, context, entry = read_appended_lines(str(path), entry)
+    records = list(NeverballParser().parse_appended(lines, context))
+
+    assert entry["offset"] == os.path.getsize(path)
+    assert {"username": "newcomer", "level": LEVELS, "score": 9008, "coins": 8, "time": "01:30"} in \
+        [{key: value for key, value in record.items() if key != "is_anomaly"} for record in records]
+    # 남은 조각(줄 중간부터 읽은 부분)이 가짜 기록으로 파싱되지 않음
+    assert all(record["username"].startswith(("player", "newcomer")) for record in records)
+
+
+def test_appended_lines_are_read_from_offset(tmp_path):
+    path = tmp_path / "easy.txt"
+    write(path, score_table())
+    lines, context, entry = read_appended_lines(str(path), None)
+    list(NeverballParser().parse_appended(lines, context))
+
+    with open(path, "a") as f:
+        f.write("level 0 0 map-easy/bonus.sol\n2500 3 late\n2600 4 partial")
+    lines, context, entry = read_appended_lines(str(path), entry)
+
+    assert lines == ["level 0 0 map-easy/bonus.sol", "2500 3 late"]
+    # 이전 묶음의 레벨 번호에서 이어짐
+    records = list(NeverballParser().parse_appended(lines, context))
+    assert [(record["username"], record["level"]) for record in records] == [("late", LEVELS + 1)]
+    # 쓰는 중인 마지막 줄은 다음에 읽음
+    assert entry["offset"] == os.path.getsize(path) - len("2600 4 partial")
+
+    lines, _, unchanged = read_appended_lines(str(path), entry)
+    assert lines == [] and unchanged["offset"] == entry["offset"]
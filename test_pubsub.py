@@ -0,0 +1,147 @@
+"""UnixSocketBackend를 워커 프로세스 2개로 실행하는 테스트 (python -m pytest test_pubsub.py)"""
+import asyncio
+import multiprocessing
+import time
+
+from pubsub import UnixSocketBackend
+
+CHANNEL = "chat:lobby"
+TIMEOUT = 10.0
+
+
+async def wait_until(condition, timeout: float = TIMEOUT) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        await asyncio.sleep(0.01)
+    return True
+
+
+async def run_worker(name: str, socket_path: str, fail_first: bool, results, done):
+    received = []
+    fail_first_done = []
+
+    def handler(channel: str, message: dict):
+        if fail_first and message["from"] != name and message["text"] == "first":
+            fail_first_done.append(True)
+            raise RuntimeError("핸들러 실패")
+        received.append((channel, message["from"], message["text"]))
+
+    backend = UnixSocketBackend(socket_path)
+    await backend.start(handler)
+    try:
+        # 다른 워커가 접속해서 접속자 수가 합쳐질 때까지 대기
+        await wait_until(lambda: backend.writer is not None)
+        backend.set_count(CHANNEL, 1)
+        connected = await wait_until(lambda: backend.total_count(CHANNEL) == 2)
+
+        backend.publish(CHANNEL, {"from": name, "text": "first"})
+        backend.publish(CHANNEL, {"from": name, "text": "second"})
+        await wait_until(lambda: sum(1 for _, sender, _ in received if sender != name) >= (1 if fail_first else 2))
+
+        results.put({
+            "name": name,
+            "connected": connected,
+            "total": backend.total_count(CHANNEL),
+            "received": received,
+            "handler_failed": bool(fail_first_done),
+            "still_running": not backend.task.done(),
+        })
+        # 상대 워커가 결과를 보낼 때까지 브로커 연결 유지
+        await asyncio.get_running_loop().run_in_executor(None, done.wait, TIMEOUT)
+    finally:
+        await backend.stop()
+
+
+def worker_main(name: str, socket_path: str, fail_first: bool, results, done):
+    asyncio.run(run_worker(name, socket_path, fail_first, results, done))
+
+
+def run_two_workers(socket_path: str, fail_first: bool = False) -> dict:
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    done = context.Event()
+    workers = [
+        context.Process(target=worker_main, args=("a", socket_path, False, results, done)),
+        context.Process(target=worker_main, args=("b", socket_path, fail_first, results, done)),
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        collected = {}
+        for _ in workers:
+            result = results.get(timeout=TIMEOUT * 2)
+            collected[result["name"]] = result
+        return collected
+    finally:
+        done.set()
+        for worker in workers:
+            worker.join(TIMEOUT)
+            if worker.is_alive():
+                worker.kill()
+
+
+def test_messages_and_counts_are_shared(tmp_path):
+    results = run_two_workers(str(tmp_path / "chat.sock"))
+
+    for name, other in (("a", "b"), ("b", "a")):
+        result = results[name]
+        assert result["connected"]
+        assert result["total"] == 2
+        # 자기 메시지는 바로, 다른 워커 메시지는 브로커를 거쳐 순서대로 전달
+        assert [text for _, sender, text in result["received"] if sender == name] == ["first", "second"]
+        assert [text for _, sender, text in result["received"] if sender == other] == ["first", "second"]
+
+
+def test_handler_error_does_not_stop_receiving(tmp_path):
+    results = run_two_workers(str(tmp_path / "chat.sock"), fail_first=True)
+
+    result = results["b"]
+    assert result["handler_failed"]
+    assert result["still_running"]
+    assert [text for _, sender, text in result["received"] if sender == "a"] == ["second"]
+
+
+async def run_resync_scenario(socket_path: str) -> dict:
+    resyncs = {"a": 0, "b": 0}
+    received = []
+
+    def on_resync(name):
+        def callback():
+            resyncs[name] += 1
+        return callback
+
+    a = UnixSocketBackend(socket_path)
+    a.worker_id = "a"
+    await a.start(lambda channel, message: received.append(message), on_resync("a"))
+    await wait_until(lambda: a.writer is not None)
+
+    b = UnixSocketBackend(socket_path)
+    b.worker_id = "b"
+    await b.start(lambda channel, message: None, on_resync("b"))
+    # 브로커에 붙기 전에 발행한 메시지는 a에 전달되지 못함 → 연결되면 a에 재동기화 요청
+    b.publish("ingest:neverball", {"rows": []})
+    b.set_count(CHANNEL, 1)
+    await wait_until(lambda: resyncs["a"] == 1)
+
+    # 브로커가 b 연결을 끊음 (송신 버퍼가 넘친 경우와 같음) → b는 재연결 후 스스로 재동기화
+    b_writer = next(writer for writer, worker in a.broker_writers.items() if worker == "b")
+    b_writer.close()
+    await wait_until(lambda: resyncs["b"] == 1 and b.writer is not None)
+    b.publish("ingest:neverball", {"rows": [1]})
+    await wait_until(lambda: received)
+
+    result = {"resyncs": dict(resyncs), "received": received, "reconnects": b.get_stats()["reconnects"]}
+    await b.stop()
+    await a.stop()
+    return result
+
+
+def test_reconnect_requests_resync(tmp_path):
+    result = asyncio.run(run_resync_scenario(str(tmp_path / "chat.sock")))
+
+    assert result["resyncs"] == {"a": 1, "b": 1}
+    assert result["reconnects"] == 1
+    # 재연결 뒤에는 다시 정상 전달
+    assert result["received"] == [{"rows": [1]}]